@@ -5,26 +5,47 @@ Implements :ref:`cli_recipemd_find`
 
 import argparse
 import collections
-import glob
+import concurrent.futures
+import functools
+import hashlib
 import itertools
+import operator
 import os
+import pickle
 import re
 import shutil
 import sys
+import time
 import unicodedata
 from math import floor, ceil
-from typing import Callable, Iterable
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple, TypeVar, FrozenSet
 
 import argcomplete
+import markdown_it
 import pyparsing
 from argcomplete import FilesCompleter
 
 import recipemd
 from recipemd.data import RecipeParser, Recipe
-from recipemd.filter import _FilterElement, FilterParser
+from recipemd.filter import _FilterElement, FilterParser, _normalize_str
 
 __all__ = ['main']
 
+T = TypeVar('T')
+
+# bump when the pickled representation of recipes changes, unpickling a different layout does not necessarily fail
+_CACHE_FORMAT = 3
+
+# cached recipes that have not been used for this long are removed
+_CACHE_MAX_AGE = 30 * 24 * 60 * 60
+
+# pruning needs a stat call per cached recipe, so it is done at most once per interval
+_CACHE_PRUNE_INTERVAL = 24 * 60 * 60
+
+# starting worker processes takes longer than parsing a few recipes, so small folders are parsed sequentially
+_MIN_PATHS_FOR_WORKER_PROCESSES = 64
+
 
 def main():
     # completions
@@ -60,34 +81,212 @@ def list_units(args):
 def list_elements(args, extractor: Callable[[Recipe], Iterable[str]]):
     counter = collections.Counter()
 
-    for recipe, path in get_filtered_recipes(args):
+    for recipe, path in iter_filtered_recipes(args):
         counter.update(extractor(recipe))
 
     if args.count:
-        result = list(counter.items())
-        result.sort(key=lambda pair: pair[1], reverse=True)
+        result = sorted(counter.items(), key=operator.itemgetter(1), reverse=True)
         max_count_length = max(len(str(c)) for c in counter.values())
         result = [f'{count:>{max_count_length}} {tag}' for tag, count in result]
     else:
-        result = list(counter)
-        result.sort(key=lambda s: s.casefold())
+        result = sorted(counter, key=str.casefold)
 
     print_result(result, args.output_multicol)
 
 
 def get_filtered_recipes(args):
-    rp = RecipeParser()
-    result = []
-    for path in glob.glob(os.path.join(args.folder, '**/*.md'), recursive=True):
-        try:
-            with open(path, 'r', encoding='UTF-8') as file:
-                recipe = rp.parse(file.read())
-            if args.expression is None or args.expression.evaluate(recipe):
-                result.append((recipe, os.path.relpath(path, args.folder)))
-        except Exception as e:
+    return list(iter_filtered_recipes(args))
+
+
+def iter_filtered_recipes(args) -> Iterator[Tuple[Recipe, str]]:
+    paths = list(_iter_recipe_paths(args.folder))
+    cache_dir = None if args.no_cache else _get_cache_dir()
+    if cache_dir is not None:
+        _prune_cache(cache_dir)
+    # files skipped without parsing can't report their errors, so they are only skipped if errors are suppressed anyway
+    required_literals = frozenset()
+    if args.expression is not None and args.no_messages:
+        required_literals = args.expression.required_literals()
+    load_recipe = functools.partial(
+        _load_filtered_recipe, expression=args.expression, required_literals=required_literals, cache_dir=cache_dir,
+    )
+    # all paths are joined onto the folder, so they can be made relative by removing it
+    folder_prefix_length = len(os.path.join(args.folder, ''))
+    for path, (recipe, error) in zip(paths, _map_paths(load_recipe, paths)):
+        if error is not None:
             if not args.no_messages:
-                print(f"An error occurred, skipping {os.path.relpath(path, args.folder)}: {e.args[0]}", file=sys.stderr)
-    return result
+                print(f"An error occurred, skipping {path[folder_prefix_length:]}: {error}", file=sys.stderr)
+        elif recipe is not None:
+            yield recipe, path[folder_prefix_length:]
+
+
+def _iter_recipe_paths(folder: str) -> Iterator[str]:
+    """
+    Recursively yields the paths of all markdown files in folder.
+
+    Equivalent to a recursive glob for `**/*.md`, including skipping hidden files and folders, but uses the file
+    type information of :func:`os.scandir` instead of an additional stat call per entry.
+    """
+    subfolders = []
+    try:
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if entry.name.startswith('.'):
+                    continue
+                if entry.name.endswith('.md') and entry.is_file():
+                    yield entry.path
+                elif entry.is_dir():
+                    subfolders.append(entry.path)
+    except OSError:
+        return
+    for subfolder in subfolders:
+        yield from _iter_recipe_paths(subfolder)
+
+
+def _map_paths(func: Callable[[str], T], paths: List[str]) -> Iterator[T]:
+    """Applies func to all paths, using worker processes if there are enough paths for this to pay off"""
+    if len(paths) < _MIN_PATHS_FOR_WORKER_PROCESSES or _available_cpu_count() < 2:
+        yield from map(func, paths)
+        return
+    with concurrent.futures.ProcessPoolExecutor(initializer=_get_recipe_parser) as executor:
+        yield from executor.map(func, paths, chunksize=16)
+
+
+def _available_cpu_count() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        # not available on all platforms, e.g. Windows and macOS
+        return os.cpu_count() or 1
+
+
+def _load_filtered_recipe(
+    path: str, expression: Optional[_FilterElement], required_literals: FrozenSet[str], cache_dir: Optional[str]
+) -> Tuple[Optional[Recipe], Optional[str]]:
+    """
+    Reads and parses the recipe at path and evaluates the filter expression against it.
+
+    Files not containing all required literals of the expression can not match and are skipped without parsing. Runs
+    in worker processes, so errors are returned as message instead of being raised.
+    """
+    try:
+        with open(path, 'rb') as file:
+            src = file.read()
+        if required_literals:
+            normalized_src = _normalize_str(src.decode('UTF-8'))
+            if not all(literal in normalized_src for literal in required_literals):
+                return None, None
+        recipe = _load_recipe_cached(src, cache_dir)
+        if expression is None or expression.evaluate(recipe):
+            return recipe, None
+        return None, None
+    except Exception as e:
+        return None, f'{e.args[0]}'
+
+
+@functools.lru_cache(maxsize=None)
+def _get_recipe_parser() -> RecipeParser:
+    """Returns the parser shared by all recipes parsed in this process, created on worker startup"""
+    return RecipeParser()
+
+
+def _get_cache_dir() -> str:
+    """
+    Returns the folder of cached recipes.
+
+    Cached recipes are only valid for the versions of recipemd and markdown-it-py and the cache format that created
+    them.
+    """
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    version = f'{recipemd.__version__}-markdown-it-py-{markdown_it.__version__}-format-{_CACHE_FORMAT}'
+    return os.path.join(cache_home, 'recipemd', 'recipes', version)
+
+
+def _prune_cache(cache_dir: str):
+    """
+    Removes the caches of other versions and formats and cached recipes that were not used for a while.
+
+    Recipes are cached by content, so every edit of a file leaves an unused entry behind. Errors are ignored, an entry
+    that can't be removed does not prevent removing the others.
+    """
+    now = time.time()
+    marker_path = os.path.join(cache_dir, '.pruned')
+    try:
+        if now - os.stat(marker_path).st_mtime < _CACHE_PRUNE_INTERVAL:
+            return
+    except OSError:
+        pass
+
+    for entry in _scandir_list(os.path.dirname(cache_dir)):
+        if entry.name == os.path.basename(cache_dir):
+            continue
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                shutil.rmtree(entry.path)
+        except OSError:
+            pass
+
+    for entry in _scandir_list(cache_dir):
+        if entry.name == '.pruned':
+            continue
+        try:
+            if now - entry.stat(follow_symlinks=False).st_mtime > _CACHE_MAX_AGE:
+                os.remove(entry.path)
+        except OSError:
+            pass
+
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        Path(marker_path).touch()
+    except OSError:
+        pass
+
+
+def _scandir_list(folder: str) -> List[os.DirEntry]:
+    """Lists the entries of folder, so they can be removed while iterating, or none if it can't be read"""
+    try:
+        with os.scandir(folder) as entries:
+            return list(entries)
+    except OSError:
+        return []
+
+
+def _load_recipe_cached(src: bytes, cache_dir: Optional[str]) -> Recipe:
+    """
+    Parses the recipe source, reusing the result of earlier runs if the file content did not change.
+
+    Parsed recipes are pickled to cache_dir, keyed by a hash of the file content. Caching is disabled if cache_dir is
+    None. Errors reading or writing the cache are ignored.
+    """
+    if cache_dir is None:
+        return _get_recipe_parser().parse(src.decode('UTF-8'))
+
+    digest = hashlib.blake2b(src, digest_size=16).hexdigest()
+    cache_path = os.path.join(cache_dir, f'{digest}.pkl')
+    try:
+        with open(cache_path, 'rb') as cache_file:
+            recipe = pickle.load(cache_file)
+    except Exception:
+        pass
+    else:
+        # the modification time marks the last use for pruning
+        try:
+            os.utime(cache_path)
+        except OSError:
+            pass
+        return recipe
+
+    recipe = _get_recipe_parser().parse(src.decode('UTF-8'))
+
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f'{cache_path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'wb') as cache_file:
+            pickle.dump(recipe, cache_file, protocol=5)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+    return recipe
 
 
 def print_result(items, output_multicol):
@@ -102,7 +301,7 @@ def print_result(items, output_multicol):
     elif output_multicol == 'rows':
         print_columns(items, transpose=True)
     else:
-        print("\n".join(items))
+        sys.stdout.writelines(f'{item}\n' for item in items)
 
 
 def print_columns(items, transpose=True):
@@ -110,7 +309,7 @@ def print_columns(items, transpose=True):
         return
 
     # normalize items so decomposed unicode chars don't break lines
-    items = [unicodedata.normalize('NFKC', item) for item in items]
+    items = [item if item.isascii() else unicodedata.normalize('NFKC', item) for item in items]
     max_item_width = max(len(item) for item in items)
     column_width = max_item_width + 2
     line_width, _ = shutil.get_terminal_size((80, 20))
@@ -126,10 +325,9 @@ def print_columns(items, transpose=True):
     else:
         matrix = [items[i:i+column_count] for i in range(0, len(items), column_count)]
 
-    for row in matrix:
-        padded_row = [val.ljust(column_width) for val in row[0:-1]]
-        padded_row.append(row[-1])
-        print("".join(padded_row))
+    # columns are only as wide as their widest item
+    column_widths = [max(map(len, column)) + 2 for column in itertools.zip_longest(*matrix, fillvalue='')]
+    sys.stdout.writelines(''.join(map(str.ljust, row[0:-1], column_widths)) + f'{row[-1]}\n' for row in matrix)
 
 
 def dir_path(path):
@@ -157,7 +355,14 @@ parser.add_argument(
     '-e', '--expression', type=create_filter_expr,
     help='Filter expression. Expects a boolean string, e.g. "cake and vegan or ingr:cheese"'
 )
-parser.add_argument('-s', '--no-messages', action='store_true', default=False, help='suppress error messages')
+parser.add_argument(
+    '-s', '--no-messages', action='store_true', default=False,
+    help='suppress error messages, this also allows skipping files that can not match the filter expression'
+)
+parser.add_argument(
+    '--no-cache', action='store_true', default=False,
+    help='Do not cache parsed recipes in $XDG_CACHE_HOME/recipemd, which defaults to ~/.cache/recipemd'
+)
 
 matrix_parser = parser.add_mutually_exclusive_group()
 matrix_parser.add_argument(
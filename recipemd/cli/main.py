@@ -4,8 +4,9 @@ Implements :ref:`cli_recipemd`
 """
 
 import argparse
+import concurrent.futures
 import decimal
-import io
+import functools
 import os
 from pprint import pprint
 import re
@@ -21,13 +22,25 @@ import recipemd
 from argcomplete.completers import ChoicesCompleter, FilesCompleter
 from recipemd.data import (Amount, Ingredient, IngredientGroup, IngredientList,
                            Recipe, RecipeParser, RecipeSerializer,
-                           get_recipe_with_yield, multiply_recipe)
+                           _is_identity_multiplier, get_recipe_with_yield, multiply_recipe)
 from yarl import URL
 
 __all__ = ['main']
 
 IL = TypeVar('IL', bound=IngredientList)
 
+_MAX_CONCURRENT_FETCHES = 8
+
+# seconds to wait for a linked recipe, so an unresponsive host can't block the run indefinitely
+_FETCH_TIMEOUT = 30
+
+# number of fetched sources and parsed recipes of linked recipes kept during a run
+_LINKED_RECIPE_CACHE_SIZE = 256
+
+# finds headings (see https://spec.commonmark.org/0.29/#atx-heading) to increase their level by one
+# note that only up to level 6 is allowed, so we will do 5 -> 6 but not 6 -> 7
+_HEADING_REGEX = re.compile(r'^( {0,3})(#{1,5}.*)$', flags=re.MULTILINE)
+
 def main(): # pragma: no cover
     # completions
     argcomplete.autocomplete(parser)
@@ -41,20 +54,29 @@ def run():
 
     # parse args
     args = parser.parse_args(namespace=Args())
+    # the export folder defaults to the recipe's file name, which stdin doesn't have
+    if args.file == '-' and args.export_links is True:
+        parser.error('argument --export-links: DIR is required when reading the recipe from stdin')
 
     # initialize
     rp = RecipeParser()
     rs = RecipeSerializer()
+    # linked recipes are memoized for a single run only, so changes are picked up by the next run
+    _fetch_linked_recipe_source_or_error.cache_clear()
+    _parse_linked_recipe.cache_clear()
 
     # read and parse recipe
-    src = args.file.read()
+    try:
+        src = _read_recipe_file(args.file)
+    except OSError as e:
+        parser.error(f"argument file: can't open '{args.file}': {e}")
     r = rp.parse(src)
 
     # scale recipe
     r = _process_scaling(r, args)
 
-    # base url for late use
-    recipe_url = URL(Path(args.file.name).absolute().as_uri())
+    # base url for late use, links in a recipe from stdin are relative to the working directory
+    recipe_url = URL(Path('<stdin>' if args.file == '-' else args.file).absolute().as_uri())
 
     # export linked recipes
     if args.export_links:
@@ -65,13 +87,21 @@ def run():
     if args.flatten:
         r = _get_flattened_recipe(r, recipe_url=recipe_url, parser=rp)
 
-    # create output depending on arguments
-    print(_create_recipe_output(r, rs, args))
+    # create output depending on arguments and write it at once
+    sys.stdout.write(f'{_create_recipe_output(r, rs, args)}\n')
+
+
+def _read_recipe_file(path: str) -> str:
+    """Reads the recipe file given on the command line, "-" meaning stdin"""
+    if path == '-':
+        return sys.stdin.buffer.read().decode('UTF-8')
+    with open(path, 'rb') as f:
+        return f.read().decode('UTF-8')
 
 
 def _yield_completer(prefix, action, parser, parsed_args):
     try:
-        src = parsed_args.file.read()
+        src = _read_recipe_file(parsed_args.file)
         r = RecipeParser().parse(src)
 
         parsed_yield = RecipeParser.parse_amount(prefix)
@@ -111,7 +141,8 @@ def _process_scaling(r: Recipe, args: 'Args'):
         if multiply.unit is not None:
             print(f'A recipe can only be multiplied with a unitless amount', file=sys.stderr)
             raise Exit()
-        r = multiply_recipe(r, multiply.factor)
+        if not _is_identity_multiplier(multiply.factor):
+            r = multiply_recipe(r, multiply.factor)
     return r
 
 
@@ -124,15 +155,15 @@ def _make_missing_yield_warning(recipe: Recipe, required_yield: Amount):
 
 def _export_links(r: Recipe, args: 'Args', recipe_url: URL, parser: RecipeParser, serializer: RecipeSerializer):
     if type(args.export_links) == bool:
-        folder = args.file.name.rsplit('.', 1)[0]
+        folder = args.file.rsplit('.', 1)[0]
     else:
         folder = args.export_links
     os.makedirs(folder, exist_ok=True)
     print(f'Writing to {folder}', file=sys.stderr)
-    link_ingredients, ingr_to_recipe = _get_linked_recipes(r, recipe_url=recipe_url, parser=parser, flatten=True)
+    link_ingredients, ingr_id_to_recipe = _get_linked_recipes(r, recipe_url=recipe_url, parser=parser, flatten=True)
     for ingredient in link_ingredients:
         try:
-            recipe = ingr_to_recipe[ingredient]
+            recipe = ingr_id_to_recipe[id(ingredient)]
         except KeyError:
             continue
         if ingredient.link is None:
@@ -157,23 +188,28 @@ def _create_recipe_output(recipe: Recipe, serializer: RecipeSerializer, args: 'A
 
 
 def _get_flattened_recipe(recipe: Recipe, *, recipe_url: URL, parser: RecipeParser, exclude_urls: FrozenSet[URL] = frozenset()) -> Recipe:
-    """Creates a new recipe with linked recipes recursively flattened"""
+    """
+    Creates a new recipe with linked recipes recursively flattened.
+
+    Ingredient lists without linked ingredients are not copied, so the result shares them with recipe and with the
+    cached linked recipes. They must not be modified.
+    """
 
     exclude_urls |= {recipe_url}
-    link_ingredients, ingr_to_recipe = _get_linked_recipes(recipe, recipe_url=recipe_url, parser=parser, exclude_urls=exclude_urls)
+    link_ingredients, ingr_id_to_recipe = _get_linked_recipes(recipe, recipe_url=recipe_url, parser=parser, exclude_urls=exclude_urls)
 
     # recipes that contain no links need not be processed
-    if not ingr_to_recipe:
+    if not ingr_id_to_recipe:
         return recipe
 
     # ingredients
-    recipe = _create_flattened_substituted_ingredients(recipe, ingr_to_recipe)
+    recipe = _create_flattened_substituted_ingredients(recipe, ingr_id_to_recipe)
 
     # instructions
     instruction_sections = []
     for ingredient in link_ingredients:
         try:
-            link_recipe = ingr_to_recipe[ingredient]
+            link_recipe = ingr_id_to_recipe[id(ingredient)]
         except KeyError:
             pass
         else:
@@ -183,32 +219,34 @@ def _get_flattened_recipe(recipe: Recipe, *, recipe_url: URL, parser: RecipePars
     if recipe.instructions:
         instruction_sections.append((recipe.title, recipe.instructions, True))
 
-    instructions = []
+    instruction_parts = []
     if len(instruction_sections) == 1 and instruction_sections[0][2]:
-        instructions.append(instruction_sections[0][1])
+        instruction_parts.append(instruction_sections[0][1])
     else:
         for heading, body, is_main_instructions in instruction_sections:
-            # find headings (see https://spec.commonmark.org/0.29/#atx-heading) and increase level by one
-            # note that only up to level 6 is allowed, so we will do 5 -> 6 but not 6 -> 7
-            new_body = re.sub(r'^( {0,3})(#{1,5}.*)$', r'\1#\2', body, flags=re.MULTILINE)
-            instructions.append(f'## {heading}\n\n{new_body}')
+            instruction_parts += ('## ', heading, '\n\n', _HEADING_REGEX.sub(r'\1#\2', body), '\n\n')
+        # no separator after the last section
+        del instruction_parts[-1:]
 
-    recipe = replace(recipe, instructions='\n\n'.join(instructions))
+    recipe = replace(recipe, instructions=''.join(instruction_parts))
 
     return recipe
 
 
 def _get_linked_recipes(recipe: Recipe, *, recipe_url: URL, parser: RecipeParser, flatten: bool = True, exclude_urls: FrozenSet[URL] = frozenset()):
-    """Gets all ingredients that have a link and a dict of the ingredient to recipe instance"""
+    """Gets all ingredients that have a link and a dict of the ingredient's id to recipe instance"""
     link_ingredients = [i for i in recipe.leaf_ingredients if i.link is not None]
-    ingr_to_recipe = dict()
+    _prefetch_linked_recipe_sources(
+        {i.link for i in link_ingredients}, recipe_url=recipe_url, exclude_urls=exclude_urls
+    )
+    ingr_id_to_recipe = dict()
     for ingredient in link_ingredients:
         try:
-            ingr_to_recipe[ingredient] = _get_linked_recipe(ingredient, recipe_url=recipe_url, parser=parser,
-                                                            flatten=flatten, exclude_urls=exclude_urls)
+            ingr_id_to_recipe[id(ingredient)] = _get_linked_recipe(ingredient, recipe_url=recipe_url, parser=parser,
+                                                                   flatten=flatten, exclude_urls=exclude_urls)
         except Exception as e:
             print(f'{e}', file=sys.stderr)
-    return link_ingredients, ingr_to_recipe
+    return link_ingredients, ingr_id_to_recipe
 
 
 def _get_linked_recipe(ingredient: Ingredient, *, recipe_url: URL, parser: RecipeParser, flatten: bool = True, exclude_urls: FrozenSet[URL] = frozenset()) -> Recipe:
@@ -221,14 +259,12 @@ def _get_linked_recipe(ingredient: Ingredient, *, recipe_url: URL, parser: Recip
         raise RuntimeError(f'''Skipping ingredient "{ingredient.name}" to prevent infinite recursion''')
 
     try:
-        with urllib.request.urlopen(str(url)) as req:
-            encoding = req.info().get_content_charset() or 'UTF-8'
-            src = req.read().decode(encoding)
+        src = _fetch_linked_recipe_source(url)
     except Exception as e:
         raise RuntimeError(f'''Couldn't find linked recipe for ingredient "{ingredient.name}"''') from e
 
     try:
-        link_recipe = parser.parse(src)
+        link_recipe = _parse_linked_recipe(src, parser)
     except Exception as e:
         raise RuntimeError(f'''Couldn't parse linked recipe for ingredient "{ingredient.name}"''') from e
 
@@ -244,30 +280,85 @@ def _get_linked_recipe(ingredient: Ingredient, *, recipe_url: URL, parser: Recip
     return link_recipe
 
 
-def _create_flattened_substituted_ingredients(ingredient_list: IL, ingr_to_recipe: Dict[Ingredient, Recipe]) -> IL:
+def _prefetch_linked_recipe_sources(links: Set[str], *, recipe_url: URL, exclude_urls: FrozenSet[URL]):
+    """Fetches multiple linked recipes concurrently, so they are already cached when processed one by one"""
+    # different links can resolve to the same recipe, and excluded recipes are skipped instead of fetched
+    urls = set()
+    for link in links:
+        try:
+            urls.add(recipe_url.join(URL(link)))
+        except Exception:
+            # reported when the linked recipe is processed
+            pass
+    urls -= exclude_urls
+    if len(urls) < 2:
+        return
+
+    # prefetching more recipes than fit into the cache would evict them again before they are processed
+    urls_to_prefetch = list(urls)[:_LINKED_RECIPE_CACHE_SIZE]
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=min(len(urls_to_prefetch), _MAX_CONCURRENT_FETCHES)
+    ) as executor:
+        for url in urls_to_prefetch:
+            executor.submit(_fetch_linked_recipe_source_or_error, url)
+
+
+# recipes are often linked multiple times, e.g. a stock used by many other recipes, so fetching and parsing is cached
+
+def _fetch_linked_recipe_source(url: URL) -> str:
+    source_or_error = _fetch_linked_recipe_source_or_error(url)
+    if isinstance(source_or_error, Exception):
+        raise source_or_error
+    return source_or_error
+
+
+@functools.lru_cache(maxsize=_LINKED_RECIPE_CACHE_SIZE)
+def _fetch_linked_recipe_source_or_error(url: URL) -> Union[str, Exception]:
+    # lru_cache doesn't cache exceptions, so they are returned to not wait for an unreachable host more than once
+    try:
+        with urllib.request.urlopen(str(url), timeout=_FETCH_TIMEOUT) as req:
+            encoding = req.info().get_content_charset() or 'UTF-8'
+            return req.read().decode(encoding)
+    except Exception as e:
+        return e
+
+
+@functools.lru_cache(maxsize=_LINKED_RECIPE_CACHE_SIZE)
+def _parse_linked_recipe(src: str, parser: RecipeParser) -> Recipe:
+    """
+    Parses a linked recipe, the result is shared by all links to the same source.
+
+    The dataclasses are frozen, but their lists are not, so the returned recipe must not be modified.
+    """
+    return parser.parse(src)
+
+
+def _create_flattened_substituted_ingredients(ingredient_list: IL, ingr_id_to_recipe: Dict[int, Recipe]) -> IL:
     result_ingredients = []
     result_groups = []
+    changed = False
 
     for ingr in ingredient_list.ingredients:
-        if ingr in ingr_to_recipe and ingr_to_recipe[ingr] is not None:
-            link_recipe = ingr_to_recipe[ingr]
+        link_recipe = ingr_id_to_recipe.get(id(ingr))
+        if link_recipe is not None:
             new_group = IngredientGroup(
                 title=_link_ingredient_title(ingr, link_recipe),
                 ingredients=link_recipe.ingredients,
                 ingredient_groups=link_recipe.ingredient_groups,
             )
             result_groups.append(new_group)
+            changed = True
         else:
             result_ingredients.append(ingr)
 
-    for ingr in ingredient_list.ingredient_groups:
-        flattened_ingr = _create_flattened_substituted_ingredients(ingr, ingr_to_recipe)
-        new_group = replace(
-            ingr,
-            ingredients=flattened_ingr.ingredients,
-            ingredient_groups=flattened_ingr.ingredient_groups,
-        )
-        result_groups.append(new_group)
+    for group in ingredient_list.ingredient_groups:
+        flattened_group = _create_flattened_substituted_ingredients(group, ingr_id_to_recipe)
+        result_groups.append(flattened_group)
+        changed = changed or flattened_group is not group
+
+    # ingredient lists without linked ingredients need not be copied, the caller must not modify the shared lists
+    if not changed:
+        return ingredient_list
 
     return replace(
         ingredient_list,
@@ -294,7 +385,7 @@ class Exit(Exception):
     pass
 
 class Args(argparse.Namespace):
-    file: io.TextIOWrapper
+    file: str
     title: bool
     ingredients: bool
     json: bool
@@ -308,7 +399,7 @@ class Args(argparse.Namespace):
 parser = argparse.ArgumentParser(description='Read and process recipemd recipes')
 
 parser.add_argument(
-    'file', type=argparse.FileType('r', encoding='UTF-8'), help='A recipemd file'
+    'file', type=str, help='A recipemd file'
 ).completer = FilesCompleter(allowednames='*.md') # type: ignore
 
 parser.add_argument('-v', '--version', action='version', version=f"%(prog)s ({recipemd.__version__})")
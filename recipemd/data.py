@@ -3,6 +3,7 @@ Defines the RecipeMD data structures, provides parser, serializer and recipe sca
 """
 #from __future__ import annotations
 
+import functools
 import re
 import unicodedata
 from dataclasses import dataclass, field, replace
@@ -20,6 +21,10 @@ __all__ = ['RecipeParser', 'RecipeSerializer', 'multiply_recipe', 'get_recipe_wi
 
 T = TypeVar('T')
 
+# Decimal constants used while parsing and serializing amounts, created once instead of on every call
+_DECIMAL_ONE = Decimal(1)
+_DECIMAL_NEG_ONE = Decimal(-1)
+
 
 @dataclass_json
 @dataclass(frozen=True)
@@ -57,8 +62,10 @@ class IngredientGroup(IngredientList):
     title: str = ""
 
 
+# Amounts and ingredients are created for every ingredient of every recipe, so they use slots to save memory. The
+# ingredient lists don't, as Python 3.10 would redeclare the slots of IngredientList in each subclass.
 @dataclass_json
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Amount:
     """
     Represents an amount, which is a factor with an associated unit.
@@ -68,7 +75,7 @@ class Amount:
 
 
 @dataclass_json
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Ingredient:    
     """
     Represents an ingredient with name and optional amount and link.
@@ -93,29 +100,37 @@ class Recipe(IngredientList):
 
 class RecipeSerializer:
     def serialize(self, recipe: Recipe, *, rounding: Optional[int] = None) -> str:
-        rep = ""
-        rep += f'# {recipe.title}\n\n'
+        parts = [f'# {recipe.title}\n\n']
         if recipe.description is not None:
-            rep += f'{recipe.description}\n\n'
+            parts.append(f'{recipe.description}\n\n')
         if len(recipe.tags) > 0:
-            rep += f'*{", ".join(recipe.tags)}*\n\n'
+            parts.append(f'*{", ".join(recipe.tags)}*\n\n')
         if len(recipe.yields) > 0:
-            rep += f'**{", ".join(self._serialize_amount(a, rounding=rounding) for a in recipe.yields)}**\n\n'
-        rep += f'---\n\n'
-        rep += ("\n".join(self._serialize_ingredient(g, 2, rounding=rounding) for g in recipe.all_ingredients)).strip()
+            parts.append(f'**{", ".join(self._serialize_amount(a, rounding=rounding) for a in recipe.yields)}**\n\n')
+        parts.append('---\n\n')
+        ingredient_parts: List[str] = []
+        self._serialize_ingredients(recipe, 2, rounding=rounding, out=ingredient_parts)
+        parts.append("".join(ingredient_parts).strip())
         if recipe.instructions is not None:
-            rep += f'\n\n---\n\n'
-            rep += recipe.instructions
-        return rep
-
-    def _serialize_ingredient(self, ingredient, level, *, rounding: Optional[int] = None):
+            parts.append('\n\n---\n\n')
+            parts.append(recipe.instructions)
+        return "".join(parts)
+
+    def _serialize_ingredients(self, ingredient_list: IngredientList, level, *, rounding: Optional[int] = None,
+                               out: List[str]):
+        for index, ingredient in enumerate(ingredient_list.all_ingredients):
+            if index > 0:
+                out.append("\n")
+            self._serialize_ingredient(ingredient, level, rounding=rounding, out=out)
+
+    def _serialize_ingredient(self, ingredient, level, *, rounding: Optional[int] = None, out: List[str]):
         if isinstance(ingredient, IngredientGroup):
-            return f'\n{"#" * level} {ingredient.title}\n\n'\
-                   + "\n".join(self._serialize_ingredient(i, level+1, rounding=rounding) for i in ingredient.all_ingredients)
+            out.append(f'\n{"#" * level} {ingredient.title}\n\n')
+            self._serialize_ingredients(ingredient, level+1, rounding=rounding, out=out)
+        elif ingredient.amount is not None:
+            out.append(f'- *{self._serialize_amount(ingredient.amount, rounding=rounding)}* {self._serialize_ingredient_text(ingredient)}')
         else:
-            if ingredient.amount is not None:
-                return f'- *{self._serialize_amount(ingredient.amount, rounding=rounding)}* {self._serialize_ingredient_text(ingredient)}'
-            return f'- {self._serialize_ingredient_text(ingredient)}'
+            out.append(f'- {self._serialize_ingredient_text(ingredient)}')
 
     @staticmethod
     def _serialize_ingredient_text(ingredient: Ingredient):
@@ -134,7 +149,7 @@ class RecipeSerializer:
         if rounding is not None:
             factor = round(factor, rounding)
         # remove trailing zeros (https://docs.python.org/3/library/decimal.html#decimal-faq)
-        factor = factor.quantize(Decimal(1)) if factor == factor.to_integral() else factor.normalize()
+        factor = factor.quantize(_DECIMAL_ONE) if factor == factor.to_integral() else factor.normalize()
         return factor
 
 
@@ -146,34 +161,52 @@ class RecipeParser:
     """
 
     _list_split = re.compile(r"(?<!\d),|,(?!\d)")
+    _newline = re.compile(r"\r\n?")
+    _line_break = re.compile(r"\n")
+
+    _list_open_types = frozenset({"bullet_list_open", "ordered_list_open"})
+    _ingredients_open_types = frozenset({"heading_open", *_list_open_types})
 
     _md_block: MarkdownIt
     _md_emph: MarkdownIt
     _md_link: MarkdownIt
 
     _src: Optional[str]
-    _src_lines: List[str]
+    _line_offsets: List[int]
     _block_tokens: List[Token]
+    # index of the next unconsumed block token, tokens are never removed from the list
+    _token_index: int
+    # index of the matching close token for each open token in _block_tokens
+    _close_indices: List[int]
 
 
     def __init__(self):
-        self._md_block = MarkdownIt()
-        self._md_block.disable("reference")
-        self._md_block.disable(
-            names=[*self._md_block.get_all_rules()["inline"], *self._md_block.get_all_rules()["inline2"]]
-        )
-
-        self._md_emph = MarkdownIt()
-        self._md_emph.disable(self._md_emph.get_all_rules()["inline"])
-        self._md_emph.enable("emphasis")
-
-        self._md_link = MarkdownIt()
-        self._md_link.disable(self._md_link.get_all_rules()["inline"])
-        self._md_link.enable("link")
+        self._md_block, self._md_emph, self._md_link = RecipeParser._create_markdown_parsers()
 
         self._src = None
-        self._src_lines = []
+        self._line_offsets = []
         self._block_tokens = []
+        self._token_index = 0
+        self._close_indices = []
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _create_markdown_parsers() -> Tuple[MarkdownIt, MarkdownIt, MarkdownIt]:
+        # markdown-it parsers keep no state between parses, so they are created once and shared by all instances
+        md_block = MarkdownIt()
+        md_block.disable("reference")
+        block_rules = md_block.get_all_rules()
+        md_block.disable(names=[*block_rules["inline"], *block_rules["inline2"]])
+
+        md_emph = MarkdownIt()
+        md_emph.disable(md_emph.get_all_rules()["inline"])
+        md_emph.enable("emphasis")
+
+        md_link = MarkdownIt()
+        md_link.disable(md_link.get_all_rules()["inline"])
+        md_link.enable("link")
+
+        return md_block, md_emph, md_link
 
     def parse(self, src: str) -> Recipe:
         """
@@ -201,28 +234,31 @@ class RecipeParser:
 
         :raises RuntimeException: If src is not a valid RecipeMD recipe.
         """
-        self._src = src
-        self._src_lines = src.splitlines()
+        # normalize line endings like markdown-it does, so token line maps can be resolved to offsets in the source
+        self._src = self._newline.sub("\n", src)
+        self._line_offsets = [0, *(match.end() for match in self._line_break.finditer(self._src)), len(self._src) + 1]
 
-        self._block_tokens = self._md_block.parse(src)
+        self._block_tokens = self._md_block.parse(self._src)
+        self._token_index = 0
+        self._close_indices = RecipeParser._get_close_indices(self._block_tokens)
 
         title = self._parse_title()
         description = self._parse_description()
         tags, yields = self._parse_tags_and_yields()
 
-        if self._block_tokens and self._block_tokens[0].type == "hr":
-            self._block_tokens.pop(0)
+        if self._peek_type() == "hr":
+            self._token_index += 1
         else:
             # TODO this hr is required, but we might just continue anyways?
-            raise RuntimeError(f"Invalid, expected hr before ingredient list, got {self._block_tokens[0] and self._block_tokens[0].type if self._block_tokens else None} instead")
+            raise RuntimeError(f"Invalid, expected hr before ingredient list, got {self._peek_type()} instead")
 
         ingredients, ingredient_groups = self._parse_ingredients()
 
-        if self._block_tokens and self._block_tokens[0].type == "hr":
-            self._block_tokens.pop(0)
-        elif self._block_tokens:
+        if self._peek_type() == "hr":
+            self._token_index += 1
+        elif self._peek_type() is not None:
             # TODO this hr is required, but we might just continue anyways?
-            raise RuntimeError(f"Invalid, expected hr before instructions, got {self._block_tokens[0] and self._block_tokens[0].type} instead")
+            raise RuntimeError(f"Invalid, expected hr before instructions, got {self._peek_type()} instead")
 
         instructions = self._parse_instructions()
 
@@ -237,12 +273,12 @@ class RecipeParser:
         )
 
     def _parse_title(self):
-        if not self._block_tokens:
+        if self._peek_type() is None:
             raise RuntimeError(
                 f"Invalid, title (heading_open with level h1) required, got None instead"
             )
 
-        heading_open_token = self._block_tokens.pop(0)
+        heading_open_token = self._next_token()
 
         # TODO title is required according to spec, maybe the parser might be more forgiving?
         if heading_open_token.type != "heading_open":
@@ -254,13 +290,17 @@ class RecipeParser:
                 f"Invalid, title (heading_open with level h1) required, got level {heading_open_token.tag} instead"
             )
 
-        heading_content_token = self._block_tokens.pop(0)
-        assert self._block_tokens.pop(0).type == "heading_close"
+        heading_content_token = self._next_token()
+        heading_close_token = self._next_token()
+        assert heading_close_token.type == "heading_close"
 
         return heading_content_token.content
 
     def _parse_description(self):
-        return self._parse_blocks_while(lambda: (self._block_tokens[0].type != "hr") and self._peek_emph_paragraph() is None)
+        return self._parse_blocks_while(self._is_description_block)
+
+    def _is_description_block(self) -> bool:
+        return self._peek_type() != "hr" and self._peek_emph_paragraph() is None
 
     def _parse_tags_and_yields(self):
         tags: List[str] = []
@@ -278,7 +318,7 @@ class RecipeParser:
                 yields = [self.parse_amount(t.strip()) for t in self._list_split.split(content)]
             
             # consume paragraph
-            del self._block_tokens[:3]            
+            self._token_index += 3
             peeked_emph_paragraph = self._peek_emph_paragraph()
         return tags, yields
 
@@ -286,12 +326,8 @@ class RecipeParser:
     def _parse_ingredients(self):
         ingredients: List[Ingredient] = []
         ingredient_groups: List[IngredientGroup] = []
-        while self._block_tokens and (
-            self._block_tokens[0].type == "heading_open" 
-            or self._block_tokens[0].type == "bullet_list_open"
-            or self._block_tokens[0].type == "ordered_list_open"
-        ):
-            if self._block_tokens[0].type == 'heading_open':
+        while self._peek_type() in self._ingredients_open_types:
+            if self._peek_type() == 'heading_open':
                 self._parse_ingredient_groups(ingredient_groups, parent_level=-1)
                 pass
             else:
@@ -299,19 +335,18 @@ class RecipeParser:
         return ingredients, ingredient_groups
 
     def _parse_ingredient_groups(self, ingredient_groups: List['IngredientGroup'], parent_level):
-        while self._block_tokens and (
-            self._block_tokens[0].type == "heading_open" 
-        ):
-            level = int(self._block_tokens[0].tag.lstrip('h'))
+        while self._peek_type() == "heading_open":
+            level = int(self._block_tokens[self._token_index].tag.lstrip('h'))
             if level <= parent_level:
                 return
 
-            self._block_tokens.pop(0)
-            heading_content_token = self._block_tokens.pop(0)
-            assert self._block_tokens.pop(0).type == "heading_close"
+            self._token_index += 1
+            heading_content_token = self._next_token()
+            heading_close_token = self._next_token()
+            assert heading_close_token.type == "heading_close"
 
             group = IngredientGroup(title=heading_content_token.content)
-            if self._block_tokens and (self._block_tokens[0].type == "bullet_list_open" or self._block_tokens[0].type == "ordered_list_open"):
+            if self._peek_type() in self._list_open_types:
                 self._parse_ingredient_list(group.ingredients)
 
             self._parse_ingredient_groups(group.ingredient_groups, parent_level=level)
@@ -319,41 +354,37 @@ class RecipeParser:
             ingredient_groups.append(group)
 
     def _parse_ingredient_list(self, ingredients: List['Ingredient']):
-        while self._block_tokens and (
-            self._block_tokens[0].type == "bullet_list_open"
-            or self._block_tokens[0].type == "ordered_list_open"
-        ):
-            list_open = self._block_tokens.pop(0)
+        while self._peek_type() in self._list_open_types:
+            list_close = self._block_tokens[self._close_indices[self._token_index]]
+            self._token_index += 1
 
-            list_close_index = RecipeParser._get_close_index(list_open, self._block_tokens)
-            list_close = self._block_tokens[list_close_index]
-            while self._block_tokens[0].type == "list_item_open":
+            while self._peek_type() == "list_item_open":
                 ingredients.append(self._parse_ingredient())
-            assert self._block_tokens.pop(0) == list_close
+            consumed_list_close = self._next_token()
+            assert consumed_list_close is list_close
 
     def _parse_ingredient(self) -> 'Ingredient':
-        list_item_open = self._block_tokens.pop(0)
+        list_item_open_index = self._token_index
+        list_item_open = self._next_token()
         assert list_item_open.type == "list_item_open"
 
 
         continuation_start_line = None
         first_paragraph_content = None
-        if self._block_tokens and self._block_tokens[0].type == "paragraph_open":
-            first_paragraph_open = self._block_tokens.pop(0)
-            first_paragraph_content = self._block_tokens.pop(0)
-            first_paragraph_close_index = RecipeParser._get_close_index(
-                first_paragraph_open, self._block_tokens
-            )
-            del self._block_tokens[: first_paragraph_close_index + 1]
+        if self._peek_type() == "paragraph_open":
+            first_paragraph_open_index = self._token_index
+            first_paragraph_open = self._next_token()
+            first_paragraph_content = self._next_token()
+            self._token_index = self._close_indices[first_paragraph_open_index] + 1
             if first_paragraph_open.map:
                 continuation_start_line = first_paragraph_open.map[1]
 
-        end_index = RecipeParser._get_close_index(list_item_open, self._block_tokens)
+        end_index = self._close_indices[list_item_open_index]
         list_item_close = self._block_tokens[end_index]
 
         if first_paragraph_content is not None:
             amount, rest = self._parse_first_emph(first_paragraph_content.content)
-            if end_index == 0:
+            if end_index == self._token_index:
                 link, name = self._parse_wrapping_link(rest)
                 pass
             else:
@@ -364,11 +395,12 @@ class RecipeParser:
             name = ""
             link = None
 
-        name_continuation = self._parse_blocks_while(lambda: self._block_tokens[0] != list_item_close, start_line=continuation_start_line)
+        name_continuation = self._parse_blocks_while(lambda: self._block_tokens[self._token_index] is not list_item_close, start_line=continuation_start_line)
         if name_continuation:
             name += "\n" + name_continuation
 
-        assert self._block_tokens.pop(0) == list_item_close
+        consumed_list_item_close = self._next_token()
+        assert consumed_list_item_close is list_item_close
 
         if not name:
             raise RuntimeError("No ingredient name!")
@@ -377,24 +409,41 @@ class RecipeParser:
         return Ingredient(name=name, amount=RecipeParser.parse_amount(amount) if amount is not None else None, link=link)
 
     def _parse_instructions(self):
-        if not self._block_tokens:
+        if self._peek_type() is None:
             return None
-        return self._parse_blocks_while(lambda: True)
-
-    _value_formats = [
-        # improper fraction (1 1/2)
-        (r'(\d+)\s+(\d+)\s*/\s*(\d+)', lambda match: Decimal(match.group(2)) + (Decimal(match.group(3)) / Decimal(match.group(4))), 3),
-        # improper fraction with unicode vulgar fraction (1 ½)
-        (r'(\d+)\s+([\u00BC-\u00BE\u2150-\u215E])', lambda match: Decimal(match.group(2)) + Decimal(unicodedata.numeric(match.group(3))), 2),
-        # proper fraction (5/6)
-        (r'(\d+)\s*/\s*(\d+)', lambda match: Decimal(match.group(2)) / Decimal(match.group(3)), 2),
-        # proper fraction with unicode vulgar fraction (⅚)
-        (r'([\u00BC-\u00BE\u2150-\u215E])', lambda match: Decimal(unicodedata.numeric(match.group(2))), 1),
-        # decimal (5,4 or 5.6)
-        (r'(\d*)[.,](\d+)', lambda match: Decimal(match.group(2) + '.' + match.group(3)), 2),
-        # integer (4)
-        (r'(\d+)', lambda match: Decimal(match.group(2)), 1)
-    ]
+        return self._parse_blocks_while()
+
+    # All formats starting with a number share one leading group, so the digits are only scanned once and a
+    # failing format does not cause the next one to scan them again.
+    _amount_format = re.compile(
+        r"""
+        ^\s*(?P<sign>-?)\s*
+        (?:
+            (?P<number>
+                (?P<whole>\d+)
+                (?:
+                    # improper fraction (1 1/2)
+                    \s+(?P<improper_numerator>\d+)\s*/\s*(?P<improper_denominator>\d+)
+                    # improper fraction with unicode vulgar fraction (1 ½)
+                    | \s+(?P<improper_vulgar>[\u00BC-\u00BE\u2150-\u215E])
+                    # proper fraction (5/6)
+                    | \s*/\s*(?P<denominator>\d+)
+                    # decimal (5,4 or 5.6)
+                    | (?P<fractional>[.,]\d+)
+                )?
+                # otherwise integer (4)
+            )
+            # proper fraction with unicode vulgar fraction (⅚)
+            | (?P<vulgar>[\u00BC-\u00BE\u2150-\u215E])
+            # decimal without integer part (.5)
+            | (?P<decimal>[.,]\d+)
+        )
+        (?P<unit>.*)$
+        """,
+        re.VERBOSE,
+    )
+    # unicode vulgar fractions matched by _amount_format, with their values converted once
+    _vulgar_fractions = {char: Decimal(unicodedata.numeric(char)) for char in "¼½¾⅐⅑⅒⅓⅔⅕⅖⅗⅘⅙⅚⅛⅜⅝⅞"}
 
     @staticmethod
     def parse_amount(amount_str: str) -> Union[Amount, None]:
@@ -415,31 +464,56 @@ class RecipeParser:
         >>> RecipeParser.parse_amount('3,5 l')
         Amount(factor=Decimal('3.5'), unit='l')
         """
-        # iterate over different value format
-        for regexp, factor_function, group_count in RecipeParser._value_formats:
-            match = re.match(r'^\s*(-?)\s*' + regexp + r'(.*)$', amount_str)
-            if match:
-                factor = factor_function(match)
-                if match.group(1) == '-':
-                    factor = -1 * factor
-                unit = match.group(group_count + 2).strip()
-                return Amount(factor, unit or None)
-            
-        unit = amount_str.strip()
-        if unit:
-            raise RuntimeError("Amount must start with a number")
+        match = RecipeParser._amount_format.match(amount_str)
+        if match is None:
+            if amount_str.strip():
+                raise RuntimeError("Amount must start with a number")
+            return None
 
-        return None
+        whole = match['whole']
+        if whole is None:
+            if match['vulgar'] is not None:
+                factor = RecipeParser._vulgar_fractions[match['vulgar']]
+            else:
+                factor = Decimal(match['decimal'].replace(',', '.'))
+        elif match['improper_numerator'] is not None:
+            factor = Decimal(whole) + (Decimal(match['improper_numerator']) / Decimal(match['improper_denominator']))
+        elif match['improper_vulgar'] is not None:
+            factor = Decimal(whole) + RecipeParser._vulgar_fractions[match['improper_vulgar']]
+        elif match['denominator'] is not None:
+            factor = Decimal(whole) / Decimal(match['denominator'])
+        elif match['fractional'] is not None:
+            # Decimal accepts the matched number as is, only a decimal comma needs to be replaced
+            factor = Decimal(match['number'].replace(',', '.'))
+        else:
+            factor = Decimal(whole)
+
+        if match['sign'] == '-':
+            factor = _DECIMAL_NEG_ONE * factor
+        unit = match['unit'].strip()
+        return Amount(factor, unit or None)
 
     def _peek_emph_paragraph(self) -> Optional[Tuple[Union[Literal['em_open'], Literal['strong_open']], str]]:
         if (
-            len(self._block_tokens) < 3
-            or self._block_tokens[0].type != "paragraph_open"
-            or self._block_tokens[1].type != "inline"
-            or self._block_tokens[2].type != "paragraph_close"
+            self._peek_type() != "paragraph_open"
+            or self._peek_type(1) != "inline"
+            or self._peek_type(2) != "paragraph_close"
         ):
             return None
-        inline_content = self._block_tokens[1].content
+
+        # the same paragraph is peeked repeatedly while parsing description, tags and yields, so the result is
+        # memoized on the paragraph token
+        paragraph_open_token = self._block_tokens[self._token_index]
+        if "recipemd_emph_paragraph" not in paragraph_open_token.meta:
+            paragraph_open_token.meta["recipemd_emph_paragraph"] = self._parse_emph_paragraph(
+                self._block_tokens[self._token_index + 1].content
+            )
+        return paragraph_open_token.meta["recipemd_emph_paragraph"]
+
+    def _parse_emph_paragraph(self, inline_content: str) -> Optional[Tuple[Union[Literal['em_open'], Literal['strong_open']], str]]:
+        # plain prose paragraphs, e.g. in the description, can't be emphasized without emphasis markers
+        if "*" not in inline_content and "_" not in inline_content:
+            return None
 
         inline_tokens = self._md_emph.parseInline(inline_content)[0].children or []
 
@@ -460,25 +534,41 @@ class RecipeParser:
 
         return (emph_open_token.type, RecipeParser._serialize_emph_inline_tokens(emph_content_tokens))
         
-    def _parse_blocks_while(self, condition: Callable[[], bool], start_line: Optional[int] = None):
+    def _parse_blocks_while(self, condition: Optional[Callable[[], bool]] = None, start_line: Optional[int] = None):
         end_line = None
-        while self._block_tokens and condition():
+        while self._peek_type() is not None and (condition is None or condition()):
             open_token = self._consume_block()        
             assert open_token.map
             start_line = start_line or open_token.map[0]
             end_line = open_token.map[1]
         if start_line is None or end_line is None:
             return None
-        return "\n".join(self._src_lines[start_line:end_line])
+        # slice up to (but excluding) the line break terminating the last line
+        return self._src[self._line_offsets[start_line]:self._line_offsets[end_line] - 1]
 
     def _consume_block(self):
-        open = self._block_tokens.pop(0)
+        open_index = self._token_index
+        open = self._next_token()
         if open.type.endswith("_open"):
-            close_index = RecipeParser._get_close_index(open, self._block_tokens)
-            del self._block_tokens[0 : close_index + 1]
+            # skip the whole block including its close token at once
+            self._token_index = self._close_indices[open_index] + 1
         return open
 
+    def _peek_type(self, offset: int = 0) -> Optional[str]:
+        """Returns the type of an upcoming block token without consuming it, or None after the last token"""
+        index = self._token_index + offset
+        return self._block_tokens[index].type if index < len(self._block_tokens) else None
+
+    def _next_token(self) -> Token:
+        token = self._block_tokens[self._token_index]
+        self._token_index += 1
+        return token
+
     def _parse_first_emph(self, first_paragraph: str):
+        # most ingredients have no amount and can't contain emphasis without emphasis markers
+        if "*" not in first_paragraph and "_" not in first_paragraph:
+            return None, first_paragraph
+
         inline_tokens = self._md_emph.parseInline(first_paragraph)[0].children or []
 
         if len(inline_tokens) and inline_tokens[0].type == "em_open":
@@ -495,7 +585,9 @@ class RecipeParser:
         return emph_content, rest
 
     def _parse_wrapping_link(self, first_paragraph: str) -> Tuple[Optional[str], str]:
-        p = self._md_link.parseInline(first_paragraph)
+        if "[" not in first_paragraph:
+            return None, first_paragraph
+
         inline_tokens = self._md_link.parseInline(first_paragraph)[0].children or []
 
         RecipeParser._consume_whitespace_text_tokens(inline_tokens)
@@ -554,6 +646,18 @@ class RecipeParser:
 
         return close_index
 
+    @staticmethod
+    def _get_close_indices(tokens: List[Token]) -> List[int]:
+        """Finds the close token of all open tokens in a single pass, indices of other tokens are meaningless"""
+        close_indices = [len(tokens)] * len(tokens)
+        open_indices = []
+        for i, token in enumerate(tokens):
+            if token.nesting == 1:
+                open_indices.append(i)
+            elif token.nesting == -1:
+                close_indices[open_indices.pop()] = i
+        return close_indices
+
 
 def multiply_recipe(recipe: Recipe, multiplier: Decimal) -> Recipe:
     """
@@ -575,9 +679,13 @@ def multiply_recipe(recipe: Recipe, multiplier: Decimal) -> Recipe:
     >>> multiplied_recipe.ingredients[1]
     Ingredient(name='Butter', amount=Amount(factor=Decimal('600'), unit='g'), link=None)
     """
-    recipe = replace(recipe, yields=[replace(y, factor=y.factor * multiplier) for y in recipe.yields if y.factor is not None])
-    recipe = _multiply_ingredient_list(recipe, multiplier)
-    return recipe
+    # a single replace for the recipe, everything below it is created with the constructors directly, which is a lot faster
+    return replace(
+        recipe,
+        yields=[Amount(factor=y.factor * multiplier, unit=y.unit) for y in recipe.yields if y.factor is not None],
+        ingredients=_multiply_ingredients(recipe.ingredients, multiplier),
+        ingredient_groups=_multiply_ingredient_groups(recipe.ingredient_groups, multiplier),
+    )
 
 
 def get_recipe_with_yield(recipe: Recipe, required_yield: Amount) -> Recipe:
@@ -597,23 +705,45 @@ def get_recipe_with_yield(recipe: Recipe, required_yield: Amount) -> Recipe:
             matching_recipe_yield = Amount(Decimal(1))
         else:
             raise StopIteration
-    recipe = multiply_recipe(recipe, required_yield.factor / matching_recipe_yield.factor)
-    return recipe
+    multiplier = required_yield.factor / matching_recipe_yield.factor
+    # scaling to the yield the recipe already has would only copy it
+    if _is_identity_multiplier(multiplier):
+        return recipe
+    return multiply_recipe(recipe, multiplier)
 
 
-IL = TypeVar('IL', bound=IngredientList)
+def _is_identity_multiplier(multiplier: Decimal) -> bool:
+    """
+    Checks if multiplying a factor by multiplier results in the same factor.
+
+    This is only the case for exactly 1, as e.g. ``Decimal('1.0')`` adds a fractional digit to the product.
+    """
+    return multiplier == 1 and multiplier.as_tuple().exponent == 0
 
-def _multiply_ingredient_list(ingredient_list: IL, multiplier: Decimal) -> IL:
-    ingredients: List[Ingredient] = [_multiply_ingredient(i, multiplier) for i in ingredient_list.ingredients]
-    ingredient_groups: List[IngredientGroup] = [_multiply_ingredient_list(ig, multiplier)
-                                                for ig in ingredient_list.ingredient_groups]
-    return replace(ingredient_list, ingredients=ingredients, ingredient_groups=ingredient_groups)
+
+def _multiply_ingredients(ingredients: List[Ingredient], multiplier: Decimal) -> List[Ingredient]:
+    return [_multiply_ingredient(i, multiplier) for i in ingredients]
+
+
+def _multiply_ingredient_groups(ingredient_groups: List[IngredientGroup], multiplier: Decimal) -> List[IngredientGroup]:
+    return [
+        IngredientGroup(
+            title=ig.title,
+            ingredients=_multiply_ingredients(ig.ingredients, multiplier),
+            ingredient_groups=_multiply_ingredient_groups(ig.ingredient_groups, multiplier),
+        )
+        for ig in ingredient_groups
+    ]
 
 
 def _multiply_ingredient(ingr: Ingredient, multiplier: Decimal) -> Ingredient:
     if ingr.amount is None:
         return ingr
-    return replace(ingr, amount=replace(
-        ingr.amount,
-        factor=ingr.amount.factor*multiplier if ingr.amount.factor is not None else None
-    ))
+    return Ingredient(
+        name=ingr.name,
+        amount=Amount(
+            factor=ingr.amount.factor*multiplier if ingr.amount.factor is not None else None,
+            unit=ingr.amount.unit,
+        ),
+        link=ingr.link,
+    )
@@ -7,12 +7,13 @@ module.
 
 """
 import itertools
+import operator
 import re
 import unicodedata
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from functools import reduce, wraps
-from typing import List, Iterable, Pattern, Type, Callable, Optional
+from functools import cached_property, lru_cache, reduce, wraps
+from typing import List, Iterable, Pattern, Type, Callable, Optional, FrozenSet
 
 from pyparsing import infixNotation, QuotedString, CaselessKeyword, opAssoc, ParserElement, Combine, \
     ParseResults, MatchFirst, Regex
@@ -92,6 +93,15 @@ class _FilterString(_ASTElement, ABC):
         """Checks if any of the elements in `to_search` match the filter string."""
         raise NotImplementedError
 
+    def required_literals(self) -> FrozenSet[str]:
+        """
+        Returns words that any string matched by this filter string contains after normalization.
+
+        The words contain no whitespace, so they can be searched for in a recipe's source even if the parser reflowed
+        the matched string.
+        """
+        return frozenset()
+
 
 @dataclass(frozen=True)
 class FuzzyFilterString(_FilterString):
@@ -101,9 +111,16 @@ class FuzzyFilterString(_FilterString):
     def _create_from_tokens(cls, toks: ParseResults):
         return cls(string=toks["string"])
 
+    @cached_property
+    def _normalized_string(self) -> str:
+        return _normalize_str(self.string)
+
+    def required_literals(self) -> FrozenSet[str]:
+        return frozenset(self._normalized_string.split())
+
     def contained_in(self, to_search: Iterable[str]) -> bool:
-        to_find_caseless = _normalize_str(self.string)
-        return any(to_find_caseless in _normalize_str(el) for el in to_search)
+        to_find_caseless = self._normalized_string
+        return any(to_find_caseless in _normalize_term(el) for el in to_search)
 
 
 @dataclass(frozen=True)
@@ -114,9 +131,16 @@ class ExactFilterString(_FilterString):
     def _create_from_tokens(cls, toks: ParseResults):
         return cls(string=toks["string"])
 
+    @cached_property
+    def _normalized_string(self) -> str:
+        return _normalize_str(self.string)
+
+    def required_literals(self) -> FrozenSet[str]:
+        return frozenset(self._normalized_string.split())
+
     def contained_in(self, to_search: Iterable[str]) -> bool:
-        to_find_caseless = _normalize_str(self.string)
-        return any(to_find_caseless == _normalize_str(el) for el in to_search)
+        to_find_caseless = self._normalized_string
+        return any(to_find_caseless == _normalize_term(el) for el in to_search)
 
 
 @dataclass(frozen=True)
@@ -138,6 +162,15 @@ class _FilterElement(_ASTElement, ABC):
         """Evaluate filter against given recipe"""
         raise NotImplementedError
 
+    def required_literals(self) -> FrozenSet[str]:
+        """
+        Returns words that the normalized source of every recipe matching this filter contains.
+
+        This allows skipping recipes that can not match without parsing them. The result may be empty, e.g. for
+        negations and regular expressions.
+        """
+        return frozenset()
+
 
 @dataclass(frozen=True)
 class FilterTerm(_FilterElement, ABC):
@@ -147,6 +180,9 @@ class FilterTerm(_FilterElement, ABC):
     def _create_from_tokens(cls, toks: ParseResults):
         return cls(filter_string=toks["filter_string"])
 
+    def required_literals(self) -> FrozenSet[str]:
+        return self.filter_string.required_literals()
+
 
 @dataclass(frozen=True)
 class TagFilterTerm(FilterTerm):
@@ -209,6 +245,9 @@ class BooleanAndOperation(_BooleanBinaryOperation):
     def evaluate(self, recipe: Recipe) -> bool:
         return all(oper.evaluate(recipe) for oper in self.operands)
 
+    def required_literals(self) -> FrozenSet[str]:
+        return frozenset().union(*(oper.required_literals() for oper in self.operands))
+
     @classmethod
     def _create_from_implicit_tokens(cls, toks: ParseResults):
         return cls(operands=list(toks[0]))
@@ -241,7 +280,7 @@ class BooleanXorOperation(_BooleanBinaryOperation):
     OPERATOR = "xor"
 
     def evaluate(self, recipe: Recipe) -> bool:
-        return reduce(lambda left, right: left ^ right, [oper.evaluate(recipe) for oper in self.operands])
+        return reduce(operator.xor, (oper.evaluate(recipe) for oper in self.operands))
 
     @_value_error_to_not_implemented
     def __xor__(self, other):
@@ -254,9 +293,18 @@ class BooleanXorOperation(_BooleanBinaryOperation):
 
 def _normalize_str(text: str):
     """Normalizes a string for evaluation of filter strings"""
+    if text.isascii():
+        # case folding ASCII is lowercasing and it is already normalized
+        return text.strip().lower()
     return unicodedata.normalize("NFKD", text.strip().casefold())
 
 
+@lru_cache(maxsize=4096)
+def _normalize_term(text: str):
+    """Cached :func:`_normalize_str` for tags, ingredient names and units, which repeat across recipes"""
+    return _normalize_str(text)
+
+
 class FilterParser:
     """Allows parsing filter strings into ASTs"""
     filter_expression_parser: ParserElement
@@ -281,6 +329,10 @@ class FilterParser:
 
     @staticmethod
     def _create_parser() -> ParserElement:
+        # the infix grammar backtracks exponentially on nested parentheses without memoization. Note that packrat is a
+        # global pyparsing setting, so this enables it for all grammars in the process.
+        ParserElement.enablePackrat(cache_size_limit=256)
+
         # operators in the format later used by infixNotation
         operator_list = [
             (None, 2, opAssoc.LEFT, BooleanAndOperation._create_from_implicit_tokens),
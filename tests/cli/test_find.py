@@ -0,0 +1,241 @@
+import concurrent.futures
+import multiprocessing
+import os
+import pickle
+import sys
+import time
+from contextlib import ExitStack
+from io import StringIO
+from typing import Dict, Tuple
+from unittest import mock
+
+import markdown_it
+import pytest
+import recipemd
+from recipemd.cli import find
+from recipemd.data import RecipeParser
+
+RECIPES = {
+    'cake.md': '# Cake\n\n*sweet*\n\n---\n\n- *200 g* flour\n- *2* eggs\n',
+    'soup.md': '# Soup\n\n*savory, vegan*\n\n---\n\n- *1 l* water\n- *2* carrots\n',
+}
+
+ProcessPoolExecutor = concurrent.futures.ProcessPoolExecutor
+
+
+@pytest.fixture(autouse=True)
+def cache_home(tmp_path, monkeypatch):
+    cache_home = tmp_path / 'cache'
+    monkeypatch.setenv('XDG_CACHE_HOME', str(cache_home))
+    return cache_home
+
+
+def write_files(folder, files: Dict[str, str]):
+    for name, content in files.items():
+        path = os.path.join(folder, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='UTF-8') as f:
+            f.write(content)
+
+
+def run_find(*arguments: str) -> Tuple[str, str]:
+    args = find.parser.parse_args(['-1', *arguments])
+    with ExitStack() as stack:
+        stack.enter_context(mock.patch('sys.stdout', new_callable=StringIO))
+        stack.enter_context(mock.patch('sys.stderr', new_callable=StringIO))
+        args.func(args)
+        return sys.stdout.getvalue(), sys.stderr.getvalue()  # type: ignore
+
+
+class TestIterRecipePaths:
+    @pytest.fixture
+    def folder(self, tmp_path):
+        recipe = RECIPES['cake.md']
+        write_files(tmp_path, {
+            'a.md': recipe,
+            'notes.txt': recipe,
+            '.hidden.md': recipe,
+            '.hidden/c.md': recipe,
+            'dir.md/d.md': recipe,
+            'sub/b.md': recipe,
+            'sub/deeper/e.md': recipe,
+            'locked/f.md': recipe,
+        })
+        return str(tmp_path)
+
+    def test_paths(self, folder, monkeypatch):
+        scandir = os.scandir
+
+        def scandir_with_locked_folder(path):
+            if os.path.basename(path) == 'locked':
+                raise PermissionError(13, 'Permission denied', path)
+            return scandir(path)
+
+        monkeypatch.setattr(os, 'scandir', scandir_with_locked_folder)
+        paths = [os.path.relpath(path, folder) for path in find._iter_recipe_paths(folder)]
+
+        assert sorted(paths) == sorted([
+            'a.md',
+            os.path.join('dir.md', 'd.md'),
+            os.path.join('sub', 'b.md'),
+            os.path.join('sub', 'deeper', 'e.md'),
+        ])
+        # files of a folder come before the files of its subfolders
+        assert paths[0] == 'a.md'
+        assert paths.index(os.path.join('sub', 'b.md')) < paths.index(os.path.join('sub', 'deeper', 'e.md'))
+
+    def test_missing_folder(self, tmp_path):
+        assert list(find._iter_recipe_paths(str(tmp_path / 'missing'))) == []
+
+    @pytest.mark.parametrize('folder_argument', ['absolute', 'trailing_separator', 'current'])
+    def test_relative_paths(self, folder, folder_argument, monkeypatch):
+        if folder_argument == 'trailing_separator':
+            folder = os.path.join(folder, '')
+        elif folder_argument == 'current':
+            monkeypatch.chdir(folder)
+            folder = '.'
+        args = find.parser.parse_args(['-s', 'recipes', folder])
+        paths = [path for recipe, path in find.get_filtered_recipes(args)]
+        assert sorted(paths) == sorted([
+            'a.md',
+            os.path.join('dir.md', 'd.md'),
+            os.path.join('locked', 'f.md'),
+            os.path.join('sub', 'b.md'),
+            os.path.join('sub', 'deeper', 'e.md'),
+        ])
+
+
+class TestRecipeCache:
+    src = RECIPES['cake.md'].encode('UTF-8')
+
+    @pytest.fixture
+    def cache_dir(self, cache_home):
+        return find._get_cache_dir()
+
+    def test_cache_dir(self, cache_home, cache_dir):
+        assert cache_dir.startswith(os.path.join(str(cache_home), 'recipemd', 'recipes', ''))
+        # recipes parsed by other versions of recipemd or markdown-it-py are not reused
+        assert recipemd.__version__ in os.path.basename(cache_dir)
+        assert markdown_it.__version__ in os.path.basename(cache_dir)
+
+    def test_miss_and_hit(self, cache_dir):
+        recipe = find._load_recipe_cached(self.src, cache_dir)
+        assert recipe == RecipeParser().parse(RECIPES['cake.md'])
+        assert [name for name in os.listdir(cache_dir) if name.endswith('.pkl')]
+
+        with mock.patch.object(find, '_get_recipe_parser') as get_recipe_parser:
+            assert find._load_recipe_cached(self.src, cache_dir) == recipe
+        get_recipe_parser.assert_not_called()
+
+    def test_corrupt_entry(self, cache_dir):
+        recipe = find._load_recipe_cached(self.src, cache_dir)
+        (cache_file,) = os.listdir(cache_dir)
+        with open(os.path.join(cache_dir, cache_file), 'wb') as f:
+            f.write(b'not a pickle')
+
+        assert find._load_recipe_cached(self.src, cache_dir) == recipe
+        with open(os.path.join(cache_dir, cache_file), 'rb') as f:
+            assert pickle.load(f) == recipe
+
+    def test_unwritable_cache_dir(self, tmp_path):
+        # a file in place of a parent folder makes the cache folder impossible to create
+        (tmp_path / 'file').write_text('')
+        cache_dir = str(tmp_path / 'file' / 'recipes')
+        assert find._load_recipe_cached(self.src, cache_dir) == RecipeParser().parse(RECIPES['cake.md'])
+
+    def test_no_cache(self, tmp_path, cache_home):
+        write_files(tmp_path / 'recipes', RECIPES)
+        stdout, stderr = run_find('--no-cache', 'recipes', str(tmp_path / 'recipes'))
+        assert sorted(stdout.splitlines()) == ['cake.md', 'soup.md']
+        assert not cache_home.exists()
+
+        stdout, stderr = run_find('recipes', str(tmp_path / 'recipes'))
+        assert sorted(stdout.splitlines()) == ['cake.md', 'soup.md']
+        assert cache_home.exists()
+
+    def test_prune(self, cache_dir):
+        old_cache_dir = os.path.join(os.path.dirname(cache_dir), '0.0.0-1')
+        write_files(old_cache_dir, {'old.pkl': ''})
+        write_files(cache_dir, {'unused.pkl': '', 'used.pkl': ''})
+        unused_time = time.time() - find._CACHE_MAX_AGE - 60
+        os.utime(os.path.join(cache_dir, 'unused.pkl'), (unused_time, unused_time))
+
+        find._prune_cache(cache_dir)
+        assert not os.path.exists(old_cache_dir)
+        assert sorted(os.listdir(cache_dir)) == ['.pruned', 'used.pkl']
+
+        # pruning is skipped until the interval has passed
+        write_files(old_cache_dir, {'old.pkl': ''})
+        find._prune_cache(cache_dir)
+        assert os.path.exists(old_cache_dir)
+
+    def test_prune_errors(self, cache_dir, monkeypatch):
+        names = ['a.pkl', 'b.pkl', 'c.pkl', 'd.pkl', 'locked.pkl']
+        write_files(cache_dir, {name: '' for name in names})
+        write_files(os.path.join(cache_dir, 'folder'), {'x.pkl': ''})
+        unused_time = time.time() - find._CACHE_MAX_AGE - 60
+        for name in [*names, 'folder']:
+            os.utime(os.path.join(cache_dir, name), (unused_time, unused_time))
+
+        remove = os.remove
+
+        def remove_unless_locked(path):
+            if os.path.basename(path) == 'locked.pkl':
+                raise PermissionError(13, 'Permission denied', path)
+            remove(path)
+
+        monkeypatch.setattr(os, 'remove', remove_unless_locked)
+        find._prune_cache(cache_dir)
+        # entries that can't be removed are skipped, regardless of the order they are listed in
+        assert sorted(os.listdir(cache_dir)) == ['.pruned', 'folder', 'locked.pkl']
+
+
+def test_errors_with_filter_expression(tmp_path):
+    write_files(tmp_path, {**RECIPES, 'broken.md': 'no title\n'})
+
+    # the broken file can't match, but its error is reported like without a filter expression
+    stdout, stderr = run_find('-e', 'sweet and flour', 'recipes', str(tmp_path))
+    assert stdout == 'cake.md\n'
+    assert stderr.startswith('An error occurred, skipping broken.md: ')
+
+    # with suppressed errors, files that can't match are not parsed at all
+    with mock.patch.object(find, '_load_recipe_cached', wraps=find._load_recipe_cached) as load_recipe_cached:
+        assert run_find('-s', '-e', 'sweet and flour', 'recipes', str(tmp_path)) == ('cake.md\n', '')
+    assert [call.args[0] for call in load_recipe_cached.call_args_list] == [RECIPES['cake.md'].encode('UTF-8')]
+
+
+@pytest.mark.parametrize('start_method', multiprocessing.get_all_start_methods())
+@pytest.mark.parametrize(
+    'arguments',
+    [
+        ['recipes'],
+        ['-e', 'sweet or vegan', 'recipes'],
+        ['ingredients', '-c'],
+    ]
+)
+def test_worker_processes(tmp_path, monkeypatch, start_method, arguments):
+    write_files(tmp_path / 'recipes', {
+        **RECIPES,
+        'broken.md': 'no title\n',
+        'sub/bread.md': '# Bread\n\n*vegan*\n\n---\n\n- *500 g* flour\n- water\n',
+        'sub/broken.md': '# Broken\n\n- *2* eggs\n',
+    })
+    folder = str(tmp_path / 'recipes')
+
+    executors = []
+
+    def create_executor(*args, **kwargs):
+        executor = ProcessPoolExecutor(*args, mp_context=multiprocessing.get_context(start_method), **kwargs)
+        executors.append(executor)
+        return executor
+
+    with monkeypatch.context() as m:
+        m.setattr(find, '_MIN_PATHS_FOR_WORKER_PROCESSES', 1)
+        m.setattr(find, '_available_cpu_count', lambda: 2)
+        m.setattr(concurrent.futures, 'ProcessPoolExecutor', create_executor)
+        parallel_output = run_find(*arguments, folder)
+    assert len(executors) == 1
+
+    sequential_output = run_find(*arguments, folder)
+    assert parallel_output == sequential_output
+    assert 'An error occurred, skipping broken.md' in sequential_output[1]
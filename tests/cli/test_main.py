@@ -2,8 +2,9 @@ import filecmp
 import os
 import shutil
 import sys
+import urllib.request
 from contextlib import ExitStack
-from io import StringIO
+from io import BytesIO, StringIO, TextIOWrapper
 from typing import List
 from unittest import mock
 
@@ -49,6 +50,55 @@ def test_valid_args(type: str, dir: str, arguments: List[str]):
     assert_equal_to_file_content(actual_stderr, expected_stderr_file)  # type: ignore
 
 
+def test_stdin():
+    test_dir = os.path.join(os.path.dirname(__file__), 'test_main', 'valid', 'basic')
+    with open(os.path.join(test_dir, 'input.md'), 'rb') as f:
+        stdin = TextIOWrapper(BytesIO(f.read()), encoding='UTF-8')
+
+    with ExitStack() as stack:
+        stack.enter_context(mock.patch('sys.argv', ['', '-']))
+        stack.enter_context(mock.patch('sys.stdin', stdin))
+        stack.enter_context(mock.patch('sys.stdout', new_callable=StringIO))
+        stack.enter_context(mock.patch('sys.stderr', new_callable=StringIO))
+        run()
+        actual_stdout = sys.stdout.getvalue()  # type: ignore
+        actual_stderr = sys.stderr.getvalue()  # type: ignore
+
+    assert_equal_to_file_content(actual_stdout, os.path.join(test_dir, 'stdout'))  # type: ignore
+    assert actual_stderr == ''
+
+
+def test_missing_file(tmp_path):
+    input_file = str(tmp_path / 'missing.md')
+    with ExitStack() as stack:
+        stack.enter_context(mock.patch('sys.argv', ['', input_file]))
+        stack.enter_context(mock.patch('sys.stdout', new_callable=StringIO))
+        stack.enter_context(mock.patch('sys.stderr', new_callable=StringIO))
+        with pytest.raises(SystemExit) as exc_info:
+            run()
+        actual_stdout = sys.stdout.getvalue()  # type: ignore
+        actual_stderr = sys.stderr.getvalue()  # type: ignore
+
+    assert exc_info.value.code == 2
+    assert actual_stdout == ''
+    assert actual_stderr.startswith('usage: ')
+    assert f"error: argument file: can't open '{input_file}': " in actual_stderr
+
+
+def test_export_links_from_stdin_requires_folder():
+    with ExitStack() as stack:
+        stack.enter_context(mock.patch('sys.argv', ['', '-', '--export-links']))
+        stack.enter_context(mock.patch('sys.stdin', TextIOWrapper(BytesIO(b'# Title\n'), encoding='UTF-8')))
+        stack.enter_context(mock.patch('sys.stdout', new_callable=StringIO))
+        stack.enter_context(mock.patch('sys.stderr', new_callable=StringIO))
+        with pytest.raises(SystemExit) as exc_info:
+            run()
+        actual_stderr = sys.stderr.getvalue()  # type: ignore
+
+    assert exc_info.value.code == 2
+    assert 'error: argument --export-links: DIR is required when reading the recipe from stdin' in actual_stderr
+
+
 def test_export_links():
     test_dir = os.path.join(os.path.dirname(__file__), 'test_main', 'export_links')
     input_file = os.path.join(test_dir, 'input.md')
@@ -84,6 +134,35 @@ def test_export_links():
     shutil.rmtree(actual_output_dir, ignore_errors=True)
 
 
+def test_missing_linked_recipe_is_fetched_once(tmp_path):
+    (tmp_path / 'input.md').write_text(
+        '# Main\n\n---\n\n- [Stock](stock.md)\n- [Missing](missing.md)\n- *2* [Missing again](./missing.md)\n'
+        '- [Main](input.md)\n',
+        encoding='UTF-8'
+    )
+    (tmp_path / 'stock.md').write_text('# Stock\n\n---\n\n- water\n', encoding='UTF-8')
+
+    with ExitStack() as stack:
+        stack.enter_context(mock.patch('sys.argv', ['', '-f', str(tmp_path / 'input.md')]))
+        stack.enter_context(mock.patch('sys.stdout', new_callable=StringIO))
+        stack.enter_context(mock.patch('sys.stderr', new_callable=StringIO))
+        urlopen = stack.enter_context(mock.patch('urllib.request.urlopen', wraps=urllib.request.urlopen))
+
+        run()
+
+        actual_stderr = sys.stderr.getvalue()  # type: ignore
+
+    # links are deduplicated after resolving them and the recipe linking itself is never fetched
+    opened_urls = [str(call.args[0]) for call in urlopen.call_args_list]
+    assert len([url for url in opened_urls if url.endswith('/missing.md')]) == 1
+    assert not [url for url in opened_urls if url.endswith('/input.md')]
+    assert actual_stderr == (
+        'Couldn\'t find linked recipe for ingredient "Missing"\n'
+        'Couldn\'t find linked recipe for ingredient "Missing again"\n'
+        'Skipping ingredient "Main" to prevent infinite recursion\n'
+    )
+
+
 def assert_equal_to_file_content(actual_str, expected_file):
     if os.environ.get('UPDATE_SNAPSHOTS'):
         if actual_str == '':
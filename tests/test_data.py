@@ -25,6 +25,12 @@ def serializer():
     return RecipeSerializer()
 
 
+@pytest.fixture(scope="session")
+def testcase_schema():
+    with open(os.path.join(os.path.dirname(__file__), '..', 'testcases', 'testcase.schema.json'), 'r', encoding='UTF-8') as f:
+        return json.loads(f.read())
+
+
 def test_ingredient_list_get_leaf_ingredients():
     recipe = Recipe(
         title="Test",
@@ -64,7 +70,7 @@ class TestRecipeParser:
         "testcase_file",
         glob.glob(os.path.join(os.path.dirname(__file__), '..', 'testcases', 'cases', '*.md')),
     )
-    def test_parse(self, parser, testcase_file):
+    def test_parse(self, parser, testcase_schema, testcase_file):
         if testcase_file.endswith('.invalid.md'):
             with pytest.raises(RuntimeError):
                 with open(testcase_file, 'r', encoding='UTF-8') as f:
@@ -77,9 +83,7 @@ class TestRecipeParser:
                 # Validate expected result against json schema
                 with open(expected_result_file, 'r', encoding='UTF-8') as f:
                     expected_result_json = json.loads(f.read())
-                with open(os.path.join(os.path.dirname(__file__), '..', 'testcases', 'testcase.schema.json'), 'r', encoding='UTF-8') as f:
-                    schema_json = json.loads(f.read())
-                jsonschema.validate(instance=expected_result_json, schema=schema_json)
+                jsonschema.validate(instance=expected_result_json, schema=testcase_schema)
 
                 # Check that recipes are equal
                 expected_result = Recipe.from_dict(expected_result_json)
@@ -90,6 +94,14 @@ class TestRecipeParser:
                 with open(expected_result_file, 'w', encoding='UTF-8') as f:
                     f.write(actual_result.to_json(indent=2))
 
+    def test_parse_line_endings(self, parser):
+        src = '# Title\n\nFirst line\nsecond line\n\n---\n\n- Ingredient\n\n---\n\nStep\x0cone\n\nStep two\n'
+        expected_result = parser.parse(src)
+        assert expected_result.description == 'First line\nsecond line'
+        assert expected_result.instructions == 'Step\x0cone\n\nStep two'
+        assert parser.parse(src.replace('\n', '\r\n')) == expected_result
+        assert parser.parse(src.replace('\n', '\r')) == expected_result
+
     def test_parse_amount(self, parser):
         assert parser.parse_amount("2") == Amount(factor=Decimal('2'))
         assert parser.parse_amount("5 g") == Amount(factor=Decimal('5'), unit='g')
@@ -171,6 +183,13 @@ def test_get_recipe_with_yield():
     assert result_unitless_from_unitless_yield.yields[0] == Amount(factor=Decimal('4'))
     assert result_unitless_from_unitless_yield.ingredients[0].amount == Amount(factor=Decimal('5'))
 
+    # scaling to the existing yield returns the recipe unchanged
+    assert get_recipe_with_yield(recipe, Amount(factor=Decimal('2'), unit='servings')) is recipe
+    # unless the yield has more fractional digits, which are kept in the scaled factors
+    result_fractional = get_recipe_with_yield(recipe, Amount(factor=Decimal('2.0'), unit='servings'))
+    assert str(result_fractional.yields[0].factor) == '2.0'
+    assert str(result_fractional.ingredients[0].amount.factor) == '5.0'
+
     # try with unit not in recipe yields
     with pytest.raises(StopIteration):
         get_recipe_with_yield(recipe, Amount(factor=Decimal('500'), unit='ml'))
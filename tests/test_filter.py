@@ -1,5 +1,7 @@
 import inspect
 import re
+import subprocess
+import sys
 from decimal import Decimal
 
 import pytest
@@ -159,3 +161,30 @@ def recipe() -> Recipe:
 ])
 def test_evaluate(recipe, filter_ast, result):
     assert filter_ast.evaluate(recipe) == result
+
+
+@pytest.mark.parametrize("filter_ast, literals", [
+    (f("Eggs"), {"eggs"}),
+    (f.tag.ex(" Tag with  Spaces"), {"tag", "with", "spaces"}),
+    (f.unit.re("g"), set()),
+    (f("Eggs") & f.ingr("Salt") & f.re("Ham"), {"eggs", "salt"}),
+    (f("Eggs") | f("Salt"), set()),
+    (f("Eggs") ^ f("Salt"), set()),
+    (~f("Eggs"), set()),
+    (f("Eggs") & ~f("Salt"), {"eggs"}),
+])
+def test_required_literals(filter_ast, literals):
+    assert filter_ast.required_literals() == literals
+
+
+def test_parse_nested_filter_string():
+    # without memoization the grammar backtracks exponentially, this took minutes and gigabytes of memory. It runs in a
+    # new process, as the setting is global and could already have been enabled by another import.
+    code = '''
+from recipemd.filter import FilterParser
+expression = "a"
+for i in range(5):
+    expression = f"(b{i} or not ({expression} xor c{i})) and d{i}"
+FilterParser().parse_filter_string(expression)
+'''
+    subprocess.run([sys.executable, '-c', code], check=True, timeout=30)